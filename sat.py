@@ -18,10 +18,124 @@ Note: pass/fail is computed as score > 30% of the configured max score.
 # hatchling - LLM generated code marker
 """
 
-import json
+import atexit
+import bisect
+import codecs
+import math
 import os
+import shutil
 import sys
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Set
+
+# The JSON backend is imported on first use, so runs that never touch the
+# data file (e.g. an immediate exit with no file yet) don't pay for loading
+# it. Until then _dumps, _loads and _iter_pretty are stubs that bind the
+# real functions and forward the call.
+
+
+def _bind_json_backend() -> None:
+    """Bind _dumps, _loads and _iter_pretty to orjson if installed, else stdlib json."""
+    global _dumps, _loads, _iter_pretty
+    try:
+        import orjson
+    except ImportError:  # orjson is optional; fall back to the stdlib encoder
+        import json as stdlib_json
+
+        pretty_encoder = stdlib_json.JSONEncoder(indent=2, ensure_ascii=False)
+
+        def _dumps(obj: Any) -> bytes:
+            # allow_nan=False: NaN/Infinity are not valid JSON and orjson cannot read them
+            return stdlib_json.dumps(
+                obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+            ).encode("utf-8")
+
+        def _iter_pretty(obj: Any) -> Iterator[bytes]:
+            for chunk in pretty_encoder.iterencode(obj):
+                yield chunk.encode("utf-8")
+
+        _loads = stdlib_json.loads
+        return
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def _iter_pretty(obj: Any) -> Iterator[bytes]:
+        yield orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes."""
+    _bind_json_backend()
+    return _dumps(obj)
+
+
+def _iter_pretty(obj: Any) -> Iterator[bytes]:
+    """Yield indented UTF-8 JSON bytes (in chunks with the stdlib encoder)."""
+    _bind_json_backend()
+    yield from _iter_pretty(obj)
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse JSON bytes."""
+    _bind_json_backend()
+    return _loads(raw)
+
+
+def _stdout_is_plain_utf8() -> bool:
+    """Return True if stdout text reaches its buffer as UTF-8 with untranslated newlines."""
+    encoding = getattr(sys.stdout, "encoding", None)
+    try:
+        is_utf8 = encoding is not None and codecs.lookup(encoding).name == "utf-8"
+    except LookupError:
+        return False
+    return is_utf8 and os.linesep == "\n"
+
+
+def _print_json(obj: Any) -> None:
+    """Print indented JSON, streaming bytes to stdout without building one big str.
+
+    The raw byte buffer is only used when it would receive exactly what print()
+    sends: UTF-8 text without newline translation. Otherwise print() is used.
+    """
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None or not _stdout_is_plain_utf8():
+        print(b"".join(_iter_pretty(obj)).decode("utf-8"))
+        return
+    # Flush pending text output so it stays ahead of the raw bytes
+    sys.stdout.flush()
+    for chunk in _iter_pretty(obj):
+        out.write(chunk)
+    out.write(b"\n")
+    out.flush()
+
+
+SEP50 = "\n" + "=" * 50
+LINE50 = "=" * 50
+SEP60 = "\n" + "=" * 60
+LINE60 = "=" * 60
+
+# Static part of the main menu; only the stats line is built per iteration
+MENU_TEXT = "\n".join([
+    SEP60,
+    "🎓 SAT RESULTS MANAGER",
+    LINE60,
+    "1.  Insert data",
+    "2.  View all data",
+    "3.  Get rank",
+    "4.  Update score",
+    "5.  Delete one record",
+    "6.  Calculate Average SAT Score",
+    "7.  Filter records by Pass/Fail Status",
+    "8.  Save data to JSON file",
+    "9.  Exit",
+    "10. Set maximum SAT score",
+    "-" * 60,
+])
+
+# Number of unsaved changes after which the data file is rewritten automatically.
+SAVE_BATCH_SIZE = 16
 
 
 class SATResultsManager:
@@ -30,14 +144,32 @@ class SATResultsManager:
     def __init__(self, data_file: str = "sat_data.json", default_max_score: int = 1600):
         self.data_file = data_file
         self.default_max_score = default_max_score
+        # Lowercased names in record insertion order, for suggestions
+        self._names_lower: Dict[str, str] = {}
+        # Names bucketed by status, plus each name's insertion sequence
+        # number so a bucket can be listed in record order
+        self._pass_names: Set[str] = set()
+        self._fail_names: Set[str] = set()
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        self._scores_sorted: List[float] = []
+        self._n = 0  # number of records
+        self._pass_threshold = 0.0
         self.data = self.load_data()
+        self._dirty = False
+        self._pending_ops = 0
     
     def load_data(self) -> Dict[str, Any]:
-        """Load data from JSON file with proper error handling."""
+        """Load data from JSON file with proper error handling.
+
+        Malformed records are skipped and reported. If anything in the file
+        could not be loaded, it is first copied to a backup so the next save
+        cannot destroy it. Also rebuilds the score index.
+        """
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                with open(self.data_file, "rb") as f:
+                    data = _loads(f.read())
                     # Validate data structure
                     if not isinstance(data, dict):
                         raise ValueError("Invalid data format")
@@ -45,33 +177,192 @@ class SATResultsManager:
                         data["max_score"] = self.default_max_score
                     if "records" not in data:
                         data["records"] = {}
+                    max_score = data["max_score"]
+                    if (not isinstance(max_score, (int, float)) or not math.isfinite(max_score)
+                            or max_score <= 0):
+                        raise ValueError("Invalid max_score")
+                    if not isinstance(data["records"], dict):
+                        raise ValueError("Invalid records format")
+                    self._pass_threshold = threshold = 0.3 * data["max_score"]
+                    # Validate, coerce and index every record in this one pass
+                    self._reset_index()
+                    names_lower = self._names_lower
+                    seq = self._seq
+                    pass_names, fail_names = self._pass_names, self._fail_names
+                    scores = self._scores_sorted
+                    skipped = []
+                    for name, record in data["records"].items():
+                        try:
+                            # Coerce once here so analytics never need float() again
+                            score = float(record["sat_score"])
+                        except (KeyError, TypeError, ValueError):
+                            score = math.nan
+                        if not math.isfinite(score):
+                            skipped.append(name)
+                            continue
+                        record["sat_score"] = score
+                        # Stored flags may have been computed against another
+                        # max score; the index relies on passed == score > threshold
+                        record["passed"] = passed = score > threshold
+                        names_lower[name] = name.lower()
+                        seq[name] = len(seq)
+                        (pass_names if passed else fail_names).add(name)
+                        scores.append(score)
+                    scores.sort()
+                    self._n = self._next_seq = len(seq)
+                    if skipped:
+                        for name in skipped:
+                            del data["records"][name]
+                        print(f"Warning: Skipped {len(skipped)} malformed record(s): {', '.join(skipped)}.")
+                        self._backup_data_file()
                     return data
-            except (json.JSONDecodeError, ValueError, IOError) as e:
+            except (ValueError, TypeError, IOError) as e:  # JSON decode errors are ValueErrors
                 print(f"Warning: Could not load data file ({e}). Starting with fresh data.")
-                return {"max_score": self.default_max_score, "records": {}}
-        else:
-            return {"max_score": self.default_max_score, "records": {}}
+                self._backup_data_file()
+
+        data = {"max_score": self.default_max_score, "records": {}}
+        self._pass_threshold = 0.3 * data["max_score"]
+        self._reset_index()
+        return data
+
+    def _backup_data_file(self) -> None:
+        """Copy the data file aside before it can be overwritten with partial data."""
+        backup_file = self.data_file + ".backup"
+        try:
+            shutil.copyfile(self.data_file, backup_file)
+            print(f"   The original file was copied to {backup_file}.")
+        except OSError as e:
+            print(f"   Could not back up the original file ({e}); the next save will overwrite it.")
 
     def save_data(self) -> bool:
-        """Save data to JSON file with error handling."""
+        """Atomically save data to JSON file with error handling.
+
+        The payload goes to a temporary file that is then renamed over the
+        data file, so on disk there is always either the old or the new
+        version, never a partially written one.
+        """
+        tmp_file = self.data_file + ".tmp"
         try:
-            with open(self.data_file, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            # Serialize up front so the file is written with a single write() call
+            payload = _dumps(self.data)
+            with open(tmp_file, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.data_file)
+            self._dirty = False
+            self._pending_ops = 0
             print(f"[Saved] Data written to {self.data_file}")
             return True
-        except IOError as e:
+        except (ValueError, TypeError, IOError) as e:
             print(f"Error saving data: {e}")
+            if os.path.exists(tmp_file):
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
             return False
 
+    def flush(self) -> bool:
+        """Save data only if there are unsaved changes."""
+        if self._dirty:
+            return self.save_data()
+        return True
+
+    def _record_change(self) -> None:
+        """Mark data as modified and save once enough changes have accumulated."""
+        self._dirty = True
+        self._pending_ops += 1
+        if self._pending_ops >= SAVE_BATCH_SIZE and not self.save_data():
+            # The file on disk is untouched; keep the change and retry on the next save
+            print("⚠️  Changes are kept in memory and will be saved again later.")
+
+    def _reset_index(self) -> None:
+        """Empty the name caches and sorted score index."""
+        self._names_lower.clear()
+        self._pass_names.clear()
+        self._fail_names.clear()
+        self._seq.clear()
+        self._scores_sorted.clear()
+        self._n = self._next_seq = 0
+
+    def _index_add(self, name: str, score: float, passed: bool) -> None:
+        """Add a record to the name caches and sorted score index."""
+        self._n += 1
+        self._names_lower[name] = name.lower()
+        self._seq[name] = self._next_seq
+        self._next_seq += 1
+        self._set_bucket(name, passed)
+        bisect.insort(self._scores_sorted, score)
+
+    def _index_remove(self, name: str, score: float) -> None:
+        """Drop a record from the name caches and sorted score index."""
+        self._n -= 1
+        del self._names_lower[name]
+        del self._seq[name]
+        self._pass_names.discard(name)
+        self._fail_names.discard(name)
+        self._scores_sorted.pop(bisect.bisect_left(self._scores_sorted, score))
+
+    def _index_update(self, name: str, old_score: float, score: float, passed: bool) -> None:
+        """Change the score and status of an indexed record."""
+        self._scores_sorted.pop(bisect.bisect_left(self._scores_sorted, old_score))
+        bisect.insort(self._scores_sorted, score)
+        self._set_bucket(name, passed)
+
+    def _set_bucket(self, name: str, passed: bool) -> None:
+        """Place a name in the pass or fail bucket."""
+        if passed:
+            self._fail_names.discard(name)
+            self._pass_names.add(name)
+        else:
+            self._pass_names.discard(name)
+            self._fail_names.add(name)
+
+    def _apply_pass_threshold(self, old_threshold: float) -> int:
+        """Recompute pass/fail after a threshold change; return how many changed.
+
+        Relies on every record's passed flag matching old_threshold, which
+        load_data guarantees by recomputing the flags when the file is read.
+        """
+        threshold = self._pass_threshold
+        if threshold == old_threshold:
+            return 0
+
+        # Only scores between the old and new threshold can change status;
+        # count them on the sorted index before touching any record.
+        low, high = min(old_threshold, threshold), max(old_threshold, threshold)
+        scores = self._scores_sorted
+        affected = bisect.bisect_right(scores, high) - bisect.bisect_right(scores, low)
+        if affected == 0:
+            return 0
+
+        updated_count = 0
+        for name, record in self.data["records"].items():
+            score = record["sat_score"]
+            if low < score <= high:
+                now_passed = score > threshold
+                record["passed"] = now_passed
+                self._set_bucket(name, now_passed)
+                updated_count += 1
+                if updated_count == affected:
+                    break
+        return updated_count
+
     def validate_score(self, score_str: str) -> Optional[float]:
         """Validate and convert score input."""
+        max_score = self.data["max_score"]
         try:
             score = float(score_str.strip())
+            if not math.isfinite(score):
+                # NaN passes both range checks and is not valid JSON
+                print("Please enter a valid numeric score.")
+                return None
             if score < 0:
                 print("Score cannot be negative.")
                 return None
-            if score > self.data["max_score"]:
-                print(f"Score cannot exceed maximum ({self.data['max_score']}).")
+            if score > max_score:
+                print(f"Score cannot exceed maximum ({max_score}).")
                 return None
             return score
         except ValueError:
@@ -80,7 +371,7 @@ class SATResultsManager:
 
     def compute_pass(self, score: float) -> bool:
         """Calculate pass/fail status based on 30% threshold."""
-        return score > 0.3 * self.data["max_score"]
+        return score > self._pass_threshold
 
     def validate_name(self, name: str) -> bool:
         """Validate candidate name."""
@@ -95,9 +386,9 @@ class SATResultsManager:
 
     def insert_data(self) -> None:
         """Insert new candidate data with comprehensive validation."""
-        print("\n" + "="*50)
+        print(SEP50)
         print("INSERT NEW CANDIDATE")
-        print("="*50)
+        print(LINE50)
         
         # Get and validate name
         while True:
@@ -126,8 +417,9 @@ class SATResultsManager:
             break
 
         # Get and validate SAT score
+        prompt = f"SAT score (0-{self.data['max_score']}): "
         while True:
-            score_input = input(f"SAT score (0-{self.data['max_score']}): ").strip()
+            score_input = input(prompt).strip()
             score = self.validate_score(score_input)
             if score is not None:
                 break
@@ -148,38 +440,35 @@ class SATResultsManager:
 
         # Save record
         self.data["records"][name] = record
-        if self.save_data():
-            print(f"\n✅ Successfully added {name} (Score: {score}, Status: {'PASS' if passed else 'FAIL'})")
-        else:
-            # Rollback if save failed
-            del self.data["records"][name]
-            print("❌ Failed to save data. Record not added.")
+        self._index_add(name, score, passed)
+        self._record_change()
+        print(f"\n✅ Successfully added {name} (Score: {score}, Status: {'PASS' if passed else 'FAIL'})")
 
     def view_all_data(self) -> None:
         """Display all records in JSON format."""
-        print("\n" + "="*50)
+        print(SEP50)
         print("ALL RECORDS (JSON FORMAT)")
-        print("="*50)
+        print(LINE50)
         
-        if not self.data["records"]:
+        if self._n == 0:
             print("📝 No records available.")
             return
         
         display_data = {
             "max_score": self.data["max_score"],
-            "total_candidates": len(self.data["records"]),
+            "total_candidates": self._n,
             "records": self.data["records"]
         }
         
-        print(json.dumps(display_data, indent=2, ensure_ascii=False))
+        _print_json(display_data)
 
     def get_rank(self) -> None:
         """Get rank for a specific candidate."""
-        print("\n" + "="*50)
+        print(SEP50)
         print("GET CANDIDATE RANK")
-        print("="*50)
+        print(LINE50)
         
-        if not self.data["records"]:
+        if self._n == 0:
             print("📝 No records available for ranking.")
             return
 
@@ -190,16 +479,17 @@ class SATResultsManager:
             return
 
         candidate = self.data["records"][name]
-        my_score = float(candidate["sat_score"])
-        all_scores = [float(r["sat_score"]) for r in self.data["records"].values()]
+        my_score = candidate["sat_score"]
+        all_scores = self._scores_sorted
 
         # Calculate rank (1-based, with ties handling)
-        higher_count = sum(1 for score in all_scores if score > my_score)
+        above = bisect.bisect_right(all_scores, my_score)
+        higher_count = self._n - above
         rank = higher_count + 1
         
         # Count candidates with same score
-        same_score_count = sum(1 for score in all_scores if score == my_score)
-        total_candidates = len(all_scores)
+        same_score_count = above - bisect.bisect_left(all_scores, my_score)
+        total_candidates = self._n
         
         # Calculate percentile
         percentile = ((total_candidates - rank + 1) / total_candidates) * 100
@@ -215,18 +505,19 @@ class SATResultsManager:
 
     def _suggest_similar_names(self, name: str) -> None:
         """Suggest similar names if exact match not found."""
-        similar = [n for n in self.data["records"].keys() 
-                  if name.lower() in n.lower() or n.lower() in name.lower()]
+        name_lower = name.lower()
+        similar = [n for n, n_lower in self._names_lower.items()
+                   if name_lower in n_lower or n_lower in name_lower][:3]
         if similar:
-            print(f"💡 Did you mean: {', '.join(similar[:3])}")
+            print(f"💡 Did you mean: {', '.join(similar)}")
 
     def update_score(self) -> None:
         """Update SAT score for an existing candidate."""
-        print("\n" + "="*50)
+        print(SEP50)
         print("UPDATE CANDIDATE SCORE")
-        print("="*50)
+        print(LINE50)
         
-        if not self.data["records"]:
+        if self._n == 0:
             print("📝 No records to update.")
             return
 
@@ -239,8 +530,9 @@ class SATResultsManager:
         current_record = self.data["records"][name]
         print(f"Current score for {name}: {current_record['sat_score']}")
 
+        prompt = f"New SAT score (0-{self.data['max_score']}): "
         while True:
-            new_score_input = input(f"New SAT score (0-{self.data['max_score']}): ").strip()
+            new_score_input = input(prompt).strip()
             new_score = self.validate_score(new_score_input)
             if new_score is not None:
                 break
@@ -251,24 +543,20 @@ class SATResultsManager:
         
         current_record["sat_score"] = new_score
         current_record["passed"] = self.compute_pass(new_score)
+        self._index_update(name, old_score, new_score, current_record["passed"])
         
-        if self.save_data():
-            print(f"\n✅ Score updated for {name}:")
-            print(f"   Old: {old_score} ({'PASS' if old_status else 'FAIL'})")
-            print(f"   New: {new_score} ({'PASS' if current_record['passed'] else 'FAIL'})")
-        else:
-            # Rollback if save failed
-            current_record["sat_score"] = old_score
-            current_record["passed"] = old_status
-            print("❌ Failed to save updated score.")
+        self._record_change()
+        print(f"\n✅ Score updated for {name}:")
+        print(f"   Old: {old_score} ({'PASS' if old_status else 'FAIL'})")
+        print(f"   New: {new_score} ({'PASS' if current_record['passed'] else 'FAIL'})")
 
     def delete_one_record(self) -> None:
         """Delete a single candidate record."""
-        print("\n" + "="*50)
+        print(SEP50)
         print("DELETE CANDIDATE RECORD")
-        print("="*50)
+        print(LINE50)
         
-        if not self.data["records"]:
+        if self._n == 0:
             print("📝 No records to delete.")
             return
 
@@ -288,55 +576,58 @@ class SATResultsManager:
         # Confirmation with exact match required
         confirm = input(f"\nType 'DELETE {name}' to confirm deletion: ").strip()
         if confirm == f"DELETE {name}":
-            backup_record = self.data["records"][name].copy()
             del self.data["records"][name]
+            self._index_remove(name, record["sat_score"])
             
-            if self.save_data():
-                print(f"✅ Record for '{name}' has been deleted.")
-            else:
-                # Restore record if save failed
-                self.data["records"][name] = backup_record
-                print("❌ Failed to save changes. Record not deleted.")
+            self._record_change()
+            print(f"✅ Record for '{name}' has been deleted.")
         else:
             print("❌ Deletion cancelled. Exact confirmation required.")
 
     def calculate_average(self) -> None:
         """Calculate and display average SAT score."""
-        print("\n" + "="*50)
+        print(SEP50)
         print("AVERAGE SAT SCORE ANALYSIS")
-        print("="*50)
+        print(LINE50)
         
-        if not self.data["records"]:
+        if self._n == 0:
             print("📝 No records available for calculation.")
             return
 
-        scores = [float(r["sat_score"]) for r in self.data["records"].values()]
-        passed_scores = [s for s, r in zip(scores, self.data["records"].values()) if r["passed"]]
-        failed_scores = [s for s, r in zip(scores, self.data["records"].values()) if not r["passed"]]
-
-        avg_overall = sum(scores) / len(scores)
-        pass_rate = (len(passed_scores) / len(scores)) * 100
-
-        print(f"📊 STATISTICS ({len(scores)} candidates)")
+        # Passing scores are exactly the tail of the sorted index above the
+        # threshold, so the totals come from C-level sums over two slices.
+        scores = self._scores_sorted
+        split = bisect.bisect_right(scores, self._pass_threshold)
+        sum_all = sum(scores)
+        sum_pass = sum(scores[split:])
+        n_all = self._n
+        n_pass = n_all - split
+        n_fail = split
+        sum_fail = sum_all - sum_pass
+
+        avg_overall = sum_all / n_all
+        pass_rate = (n_pass / n_all) * 100
+
+        print(f"📊 STATISTICS ({n_all} candidates)")
         print(f"   Overall Average: {avg_overall:.2f} / {self.data['max_score']} ({avg_overall/self.data['max_score']*100:.1f}%)")
-        print(f"   Pass Rate: {pass_rate:.1f}% ({len(passed_scores)} passed, {len(failed_scores)} failed)")
-        print(f"   Passing Threshold: {0.3 * self.data['max_score']:.1f}")
+        print(f"   Pass Rate: {pass_rate:.1f}% ({n_pass} passed, {n_fail} failed)")
+        print(f"   Passing Threshold: {self._pass_threshold:.1f}")
         
-        if passed_scores:
-            avg_passed = sum(passed_scores) / len(passed_scores)
+        if n_pass:
+            avg_passed = sum_pass / n_pass
             print(f"   Average (Passed): {avg_passed:.2f}")
         
-        if failed_scores:
-            avg_failed = sum(failed_scores) / len(failed_scores)
+        if n_fail:
+            avg_failed = sum_fail / n_fail
             print(f"   Average (Failed): {avg_failed:.2f}")
 
     def filter_by_pass_fail(self) -> None:
         """Filter and display records by pass/fail status."""
-        print("\n" + "="*50)
+        print(SEP50)
         print("FILTER BY PASS/FAIL STATUS")
-        print("="*50)
+        print(LINE50)
         
-        if not self.data["records"]:
+        if self._n == 0:
             print("📝 No records available.")
             return
 
@@ -346,34 +637,37 @@ class SATResultsManager:
             return
 
         want_pass = choice == "pass"
-        filtered_records = [r for r in self.data["records"].values() if r.get("passed") == want_pass]
+        records = self.data["records"]
+        bucket = self._pass_names if want_pass else self._fail_names
+        # Sets are unordered; list the bucket in record insertion order
+        filtered_records = [records[name] for name in sorted(bucket, key=self._seq.__getitem__)]
 
         if not filtered_records:
             print(f"📝 No candidates with {choice.upper()} status found.")
             return
 
         print(f"\n{'✅ PASSED' if want_pass else '❌ FAILED'} CANDIDATES ({len(filtered_records)} found)")
-        print("="*50)
-        print(json.dumps(filtered_records, indent=2, ensure_ascii=False))
+        print(LINE50)
+        _print_json(filtered_records)
 
     def explicit_save(self) -> None:
         """Explicitly save data to JSON file."""
-        print("\n" + "="*50)
+        print(SEP50)
         print("SAVE DATA TO JSON FILE")
-        print("="*50)
+        print(LINE50)
         
         if self.save_data():
             print(f"✅ Data successfully saved to {self.data_file}")
-            print(f"   Records: {len(self.data['records'])}")
+            print(f"   Records: {self._n}")
             print(f"   Max Score: {self.data['max_score']}")
         else:
             print("❌ Failed to save data to file.")
 
     def set_max_score(self) -> None:
         """Set maximum SAT score and recalculate pass/fail status."""
-        print(f"\n" + "="*50)
+        print(SEP50)
         print("SET MAXIMUM SAT SCORE")
-        print("="*50)
+        print(LINE50)
         print(f"Current max score: {self.data['max_score']}")
         
         while True:
@@ -384,6 +678,9 @@ class SATResultsManager:
             
             try:
                 new_max = float(new_max_input)
+                if not math.isfinite(new_max):
+                    print("❌ Please enter a valid number.")
+                    continue
                 if new_max <= 0:
                     print("❌ Please enter a positive number.")
                     continue
@@ -393,77 +690,57 @@ class SATResultsManager:
 
         old_max = self.data["max_score"]
         self.data["max_score"] = new_max
+        old_threshold = self._pass_threshold
+        self._pass_threshold = 0.3 * new_max
         
         # Recalculate pass/fail for all records
-        updated_count = 0
-        for record in self.data["records"].values():
-            old_status = record["passed"]
-            record["passed"] = self.compute_pass(record["sat_score"])
-            if old_status != record["passed"]:
-                updated_count += 1
+        updated_count = self._apply_pass_threshold(old_threshold)
 
-        if self.save_data():
-            print(f"✅ Max score updated: {old_max} → {new_max}")
-            if updated_count > 0:
-                print(f"   {updated_count} candidate(s) had their pass/fail status updated.")
-        else:
-            # Rollback on save failure
-            self.data["max_score"] = old_max
-            for record in self.data["records"].values():
-                record["passed"] = self.compute_pass(record["sat_score"])
-            print("❌ Failed to save changes. Max score not updated.")
+        self._record_change()
+        print(f"✅ Max score updated: {old_max} → {new_max}")
+        if updated_count > 0:
+            print(f"   {updated_count} candidate(s) had their pass/fail status updated.")
 
     def display_menu(self) -> None:
         """Display the main menu."""
-        print("\n" + "="*60)
-        print("🎓 SAT RESULTS MANAGER")
-        print("="*60)
-        print("1.  Insert data")
-        print("2.  View all data")
-        print("3.  Get rank")
-        print("4.  Update score")
-        print("5.  Delete one record")
-        print("6.  Calculate Average SAT Score")
-        print("7.  Filter records by Pass/Fail Status")
-        print("8.  Save data to JSON file")
-        print("9.  Exit")
-        print("10. Set maximum SAT score")
-        print("-" * 60)
-        print(f"📈 Current Stats: {len(self.data['records'])} candidates, Max Score: {self.data['max_score']}")
+        print(MENU_TEXT)
+        print(f"📈 Current Stats: {self._n} candidates, Max Score: {self.data['max_score']}")
 
     def run(self) -> None:
         """Main program loop."""
         # Welcome message
-        if not self.data["records"] and self.data["max_score"] == self.default_max_score:
+        if self._n == 0 and self.data["max_score"] == self.default_max_score:
             print("🎓 Welcome to SAT Results Manager!")
             print(f"Default max score is {self.default_max_score}. You can change this in the menu.")
 
+        # Safety net in case the loop is left without reaching the final flush
+        atexit.register(self.flush)
+
+        # Bind the menu handlers once instead of walking an elif chain per choice
+        dispatch = {
+            "1": self.insert_data,
+            "2": self.view_all_data,
+            "3": self.get_rank,
+            "4": self.update_score,
+            "5": self.delete_one_record,
+            "6": self.calculate_average,
+            "7": self.filter_by_pass_fail,
+            "8": self.explicit_save,
+            "10": self.set_max_score,
+        }
+        display_menu = self.display_menu
+
         while True:
             try:
-                self.display_menu()
+                display_menu()
                 choice = input("\nChoose an option (1-10): ").strip()
                 
-                if choice == "1":
-                    self.insert_data()
-                elif choice == "2":
-                    self.view_all_data()
-                elif choice == "3":
-                    self.get_rank()
-                elif choice == "4":
-                    self.update_score()
-                elif choice == "5":
-                    self.delete_one_record()
-                elif choice == "6":
-                    self.calculate_average()
-                elif choice == "7":
-                    self.filter_by_pass_fail()
-                elif choice == "8":
-                    self.explicit_save()
+                handler = dispatch.get(choice)
+                if handler is not None:
+                    handler()
                 elif choice == "9":
                     print("\n👋 Thank you for using SAT Results Manager. Goodbye!")
                     break
-                elif choice == "10":
-                    self.set_max_score()
                 else:
                     print("❌ Invalid choice. Please enter a number from 1 to 10.")
                 
@@ -477,11 +754,17 @@ class SATResultsManager:
                 print(f"❌ An unexpected error occurred: {e}")
                 print("Please try again or contact support if the problem persists.")
 
+        # Write out any changes that have not reached the batch size yet;
+        # this is the last attempt, so drop the exit hook either way
+        atexit.unregister(self.flush)
+        if not self.flush():
+            print(f"❌ Unsaved changes could not be written to {self.data_file}.")
+
 
-def main():
+def main(default_max_score: int = 1600):
     """Entry point of the application."""
     try:
-        manager = SATResultsManager()
+        manager = SATResultsManager(default_max_score=default_max_score)
         manager.run()
     except Exception as e:
         print(f"❌ Fatal error: {e}")
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+SAT Results Manager - 100-point entry point.
+
+Runs the SATResultsManager from sat.py with a default maximum score of 100
+instead of 1600. All behaviour lives in sat.py.
+"""
+
+from sat import main
+
+
+if __name__ == "__main__":
+    main(default_max_score=100)